@@ -2,12 +2,110 @@
 # acrcloudwebapi.py - interface with ACRCloud's music recognition web API
 
 import base64
-import hashlib
+import collections
+import concurrent.futures
+import copy
+import functools
 import hmac
+import inspect
 import json
+import os
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # Only needed for AsyncACRCloudConsole
+    import httpx
+except ImportError:
+    httpx = None
+try:  # Faster json parsing when available
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+_DEFAULT_BUCKETS_JSON = '[{"name":"ACRCloud Music"}]'
+_json_encode = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+def _new_session() -> requests.Session:
+    """Helper function.
+
+    Returns a session whose connection pool can keep many concurrent HTTPS connections warm
+    and which retries idempotent requests on transient gateway errors.
+    DELETE is not retried, since a retry after the origin already deleted the resource would report a false 404.
+    Once retries run out the last error response is returned, so callers still get requests.HTTPError."""
+
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                    allowed_methods=frozenset({'HEAD', 'GET', 'PUT', 'OPTIONS', 'TRACE'}), raise_on_status=False)
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=64, max_retries=retries))
+    return session
+
+def _decode(response):
+    """Helper function.
+
+    Raises for an HTTP error status, otherwise returns the decoded json response body (None if empty)."""
+
+    response.raise_for_status()
+    return _loads(response.content) if response.content else None
+
+def _ttl_cache(maxsize: int=128, ttl: float=10.0):
+    """Helper decorator.
+
+    Memoizes a console method's response per instance, keyed by method name and arguments, for ttl seconds.
+    At most maxsize responses are kept, evicting the least recently used.
+    Callers get their own copy of a cached response, so mutating it does not affect the cache.
+    A response is not stored if the cache was invalidated while it was being fetched, e.g. by a concurrent write.
+    Awaitable responses (from AsyncACRCloudConsole) are cached once awaited."""
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            bound = signature.bind(self, *args, **kwargs)
+            key = (method.__name__, tuple(bound.arguments.values())[1:])
+            with self._cache_lock:
+                entry = cache.get(key)
+                if entry is not None and time.monotonic() - entry[0] < ttl:
+                    cache.move_to_end(key)
+                    _, value, is_async = entry
+                    value = copy.deepcopy(value)
+                    return _resolved(value) if is_async else value
+                generation = self._cache_generation
+
+            def store(value, is_async):
+                with self._cache_lock:
+                    if self._cache_generation != generation:
+                        return
+                    cache[key] = (time.monotonic(), copy.deepcopy(value), is_async)
+                    cache.move_to_end(key)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+
+            value = method(self, *args, **kwargs)
+            if inspect.isawaitable(value):
+                return _store_when_done(value, store)
+            store(value, False)
+            return value
+        return wrapper
+    return decorator
+
+async def _resolved(value):
+    """Helper function."""
+
+    return value
+
+async def _store_when_done(awaitable, store):
+    """Helper function."""
+
+    value = await awaitable
+    store(value, True)
+    return value
+
 
 class ACRCloudConsole:
     """ACRCloud's web API console for remotely managing projects.
@@ -18,30 +116,105 @@ class ACRCloudConsole:
 
     See www.acrcloud.com/docs/audio-fingerprinting-api/console-api/projects"""
 
-    def __init__(self, account_access_key: str, account_access_secret: bytes):
-        """Get account_access_key and account_access_secret by creating an account on acrcloud.com"""
+    def __init__(self, account_access_key: str, account_access_secret: bytes, timeout=(5, 30)):
+        """Get account_access_key and account_access_secret by creating an account on acrcloud.com
+
+        account_access_secret may also be given as str, in which case it is utf-8 encoded
+
+        timeout is seconds as a (connect, read) tuple or a single number for both"""
 
         self.access_key = account_access_key
-        self.access_secret = account_access_secret
+        if isinstance(account_access_secret, str):
+            self.access_secret = account_access_secret.encode()
+        elif isinstance(account_access_secret, (bytes, bytearray, memoryview)):
+            self.access_secret = bytes(account_access_secret)
+        else:
+            raise TypeError(f'account_access_secret must be bytes or str, not {type(account_access_secret).__name__}')
         self.host = 'api.acrcloud.com'
         self.signature_version = '1'
+        self._sig_suffix = f'\n{self.access_key}\n{self.signature_version}\n'
+        self._header_base = {'access-key': self.access_key, 'signature-version': self.signature_version}
+        self._base_url = f'https://{self.host}'
+        self._timeout = timeout
+        self._session = self._open_session()
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+
+        self._session.close()
+
+    def _open_session(self):
+        """Helper function."""
+
+        return _new_session()
+
+    def invalidate(self, stream_id: str=None, project_name: str=None):
+        """Evict cached responses of get_project, list_projects, get_all_monitors and get_monitor.
+
+        With no arguments the whole cache is cleared.
+        Otherwise only entries called with the given stream_id or project_name are evicted, along with the project and monitor lists.
+        get_monitor entries are keyed by stream_id alone, so evicting by project_name does not reach them.
+
+        Every request that changes a project or monitor clears the whole cache once it completes.
+        Responses still being fetched when the cache is invalidated are not stored."""
+
+        with self._cache_lock:
+            self._cache_generation += 1
+            if stream_id is None and project_name is None:
+                self._cache.clear()
+                return
+            listings = {'list_projects'} if stream_id is None else {'list_projects', 'get_all_monitors'}
+            for key in list(self._cache):
+                name, args = key
+                if name in listings or stream_id in args or project_name in args:
+                    self._cache.pop(key, None)
 
-    def _sign(self, string_to_sign: str):
+    def _sign(self, string_to_sign: bytes) -> str:
         """Helper function.
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/console-api/signing-requests"""
 
-        return base64.b64encode(
-            hmac.new(
-                self.access_secret, string_to_sign.encode(), digestmod=hashlib.sha1)
-            .digest())
+        return base64.b64encode(hmac.digest(self.access_secret, string_to_sign, 'sha1')).decode('ascii')
 
-    def _headers(self, signature, timestamp: str) -> dict:
+    def _headers(self, signature: str, timestamp: str) -> dict:
         """Helper function."""
 
-        return {'access-key': self.access_key, 'signature-version': self.signature_version, 'signature': signature, 'timestamp': timestamp}
+        return {**self._header_base, 'signature': signature, 'timestamp': timestamp}
 
-    def add_project(self, project_name: str, type_: str='BM-ACRC', buckets: list=None, audio_type: int=2, external_id: str='', region: str='ap-southeast-1') -> str:
+    def _signed_headers(self, http_method: str, uri: str) -> dict:
+        """Helper function.
+
+        Returns the headers for a request signed with the current timestamp."""
+
+        timestamp = str(int(time.time()))
+        string_to_sign = f'{http_method}\n{uri}{self._sig_suffix}{timestamp}'.encode()
+        signature = self._sign(string_to_sign)
+        return self._headers(signature, timestamp)
+
+    def _signed_request(self, http_method: str, uri: str, data: dict=None, params: dict=None):
+        """Helper function.
+
+        Signs and sends a request to the console API and returns the decoded json response body (None if empty).
+        Raises requests.HTTPError for an error status."""
+
+        headers = self._signed_headers(http_method, uri)
+        try:
+            response = self._session.request(http_method, f'{self._base_url}{uri}', data=data, params=params, headers=headers, timeout=self._timeout)
+        finally:
+            if http_method != 'GET':
+                self.invalidate()
+        return _decode(response)
+
+    def add_project(self, project_name: str, type_: str='BM-ACRC', buckets: list=None, audio_type: int=2, external_id: str='', region: str='ap-southeast-1') -> dict:
         """Add a project.
 
         type_ (str) is project type, which can be:
@@ -60,109 +233,56 @@ class ACRCloudConsole:
             Asia (Singapore): "ap-southeast-1" (default)
             Europe (Ireland): "eu-west-1"
 
-        Response is json string with keys "access_key", "access_secret", "name", "region", "created_at"
+        Response is decoded json with keys "access_key", "access_secret", "name", "region", "created_at"
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/console-api/projects"""
 
-        if buckets is None:
-            buckets = [{'name': 'ACRCloud Music'}]
-
-        http_method = 'POST'
         uri = '/v1/projects'
-        timestamp = str(time.time())
+        buckets = _DEFAULT_BUCKETS_JSON if buckets is None else _json_encode(buckets)
+        data = {'name': project_name, 'region': region, 'type': type_, 'buckets': buckets, 'audio_type': audio_type, 'external_id': external_id}
+        return self._signed_request('POST', uri, data=data)
 
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-        data = {'name': project_name, 'region': region, 'type': type_, 'buckets': json.dumps(buckets), 'audio_type': audio_type, 'external_id': external_id}
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.post(requrl, data=data, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
-
-    def update_project(self, project_name: str, buckets: list=None) -> str:
+    def update_project(self, project_name: str, buckets: list=None) -> dict:
         """Update a project's buckets.
 
         buckets (list) gets converted to json [{"id":id, "name":name}]. Name is "ACRCloud Music" (default) or "ACRCloud Chinese TV"
 
-        Response is json string with keys "access_key", "access_secret", "name", "region", "update_at"
+        Response is decoded json with keys "access_key", "access_secret", "name", "region", "update_at"
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/console-api/projects"""
 
-        if buckets is None:
-            buckets = [{'name': 'ACRCloud Music'}]
-        
-        http_method = 'POST'  # Or should this be PUT?
-        uri = '/v1/projects/' + project_name
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-        data = {'buckets': json.dumps(buckets)}
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.post(requrl, data=data, headers=headers, verify=True)  # Or should this be requests.put?
-        response.encoding = 'utf-8'
-        return response.text
+        uri = f'/v1/projects/{project_name}'
+        data = {'buckets': _DEFAULT_BUCKETS_JSON if buckets is None else _json_encode(buckets)}
+        return self._signed_request('POST', uri, data=data)  # Or should this be PUT?
 
-    def delete_project(self, project_name: str) -> str:
+    def delete_project(self, project_name: str) -> dict:
         """Delete a project.
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/console-api/projects"""
 
-        http_method = 'DELETE'
-        uri = '/v1/projects/' + project_name
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
+        uri = f'/v1/projects/{project_name}'
         data = {'name': project_name}
+        return self._signed_request('DELETE', uri, data=data)
 
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.delete(requrl, data=data, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
-
-    def get_project(self, project_name: str) -> str:
+    @_ttl_cache()
+    def get_project(self, project_name: str) -> dict:
         """Get a project's details(?)
 
         Not documented in ACRCloud docs."""
 
-        http_method = 'GET'
-        uri = '/v1/projects/' + project_name
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.get(requrl, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
+        uri = f'/v1/projects/{project_name}'
+        return self._signed_request('GET', uri)
 
-    def list_projects(self):
+    @_ttl_cache()
+    def list_projects(self) -> dict:
         """Get a list of projects.
 
         Not documented in ACRCloud docs."""
 
-        http_method = 'GET'
         uri = '/v1/projects'
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.get(requrl, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
+        return self._signed_request('GET', uri)
 
-    def add_monitor(self, project_name: str, stream_name: str, url: str, region: str='ap-southeast-1', realtime: int=1, record: int=0) -> str:
+    def add_monitor(self, project_name: str, stream_name: str, url: str, region: str='ap-southeast-1', realtime: int=1, record: int=0) -> dict:
         """Add a stream to a project for monitoring.
 
         url (str) is a radio station url with an appropriate media file suffix
@@ -179,25 +299,15 @@ class ACRCloudConsole:
 
         record (int) can be 0 (default) or 1  # What does this mean?
 
-        Response is json string with keys "url", "state", "interval", "rec_length", "rec_timeout", "stream_name", "id", "realtime", "record"
+        Response is decoded json with keys "url", "state", "interval", "rec_length", "rec_timeout", "stream_name", "id", "realtime", "record"
 
         See https://www.acrcloud.com/docs/audio-fingerprinting-api/console-api/monitors/"""
 
-        http_method = 'POST'
         uri = '/v1/monitor-streams'
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
         data = {'project_name': project_name, 'stream_name': stream_name, 'url': url, 'region': region, 'realtime': realtime, 'record': record}
+        return self._signed_request('POST', uri, data=data)
 
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.post(requrl, data=data, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
-
-    def update_monitor(self, stream_id: str, stream_name: str, url: str, region: str='ap-southeast-1', realtime: int=1, record: int=0) -> str:
+    def update_monitor(self, stream_id: str, stream_name: str, url: str, region: str='ap-southeast-1', realtime: int=1, record: int=0) -> dict:
         """Update a project stream.
 
         url (str) is a radio station url with an appropriate media file suffix
@@ -214,127 +324,133 @@ class ACRCloudConsole:
 
         record (int) can be 0 or 1  # What does this mean?
 
-        Response is json string with keys "url", "state", "interval", "rec_length", "rec_timeout", "stream_name", "id", "region", "realtime", "record"
+        Response is decoded json with keys "url", "state", "interval", "rec_length", "rec_timeout", "stream_name", "id", "region", "realtime", "record"
 
         See https://www.acrcloud.com/docs/audio-fingerprinting-api/console-api/monitors/"""
 
-        http_method = 'PUT'
-        uri = '/v1/monitor-streams/' + stream_id
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
+        uri = f'/v1/monitor-streams/{stream_id}'
         data = {'stream_name': stream_name, 'url': url, 'region': region, 'realtime': realtime, 'record': record}
+        return self._signed_request('PUT', uri, data=data)
 
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.put(requrl, data=data, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
-
-    def get_all_monitors(self, project_name: str) -> str:
+    @_ttl_cache()
+    def get_all_monitors(self, project_name: str) -> dict:
         """Get a list of all monitors on the project.
 
-        Response is json string with the following keys and sub-keys:
+        Response is decoded json with the following keys and sub-keys:
             "items": for each item: "id", "url", "state", "interval", "rec_length", "rec_timeout", "stream_name"
             "_links": "self": "href"
             "_meta": "totalCount", "pageCount", "currentPage", "perPage"
 
         See https://www.acrcloud.com/docs/audio-fingerprinting-api/console-api/monitors/"""
 
-        http_method = 'GET'
         uri = '/v1/monitor-streams'
-        timestamp = str(time.time())
+        params = {'project_name': project_name}
+        return self._signed_request('GET', uri, params=params)
 
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-        data = {'project_name': project_name}
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.put(requrl, data=data, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
-
-    def get_monitor(self, stream_id: str) -> str:
+    @_ttl_cache()
+    def get_monitor(self, stream_id: str) -> dict:
         """Get a monitor's details.
 
-        Response is json string with keys "id", "url", "state", "interval", "rec_length", "rec_timeout", "stream_name"
+        Response is decoded json with keys "id", "url", "state", "interval", "rec_length", "rec_timeout", "stream_name"
 
         See https://www.acrcloud.com/docs/audio-fingerprinting-api/console-api/monitors/"""
 
-        http_method = 'GET'
-        uri = '/v1/monitor-streams/' + stream_id
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.get(requrl, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
+        uri = f'/v1/monitor-streams/{stream_id}'
+        return self._signed_request('GET', uri)
 
-    def delete_monitor(self, stream_id: str) -> str:
+    def delete_monitor(self, stream_id: str) -> dict:
         """Delete a monitor.
 
         See https://www.acrcloud.com/docs/audio-fingerprinting-api/console-api/monitors/"""
 
-        http_method = 'DELETE'
-        uri = '/v1/monitor-streams/' + stream_id
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
+        uri = f'/v1/monitor-streams/{stream_id}'
+        return self._signed_request('DELETE', uri)
 
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.delete(requrl, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
-
-    def action_monitor(self, stream_id: str, action: str) -> str:
+    def action_monitor(self, stream_id: str, action: str) -> dict:
         """Pause or restart a monitor.
 
         action (str) is "pause" or "restart"
 
-        Response is json string {"message": "success"} if successful
+        Response is decoded json {"message": "success"} if successful
 
         See https://www.acrcloud.com/docs/audio-fingerprinting-api/console-api/monitors/"""
 
-        http_method = 'PUT'
-        uri = '/v1/monitor-streams/{}/{}'.format(stream_id, action)
-        timestamp = str(time.time())
-
-        string_to_sign = '\n'.join((http_method, uri, self.access_key, self.signature_version, timestamp))
-        signature = self._sign(string_to_sign)
-        headers = self._headers(signature, timestamp)
-
-        requrl = 'https://{}{}'.format(self.host, uri)
-        response = requests.put(requrl, headers=headers, verify=True)
-        response.encoding = 'utf-8'
-        return response.text
+        uri = f'/v1/monitor-streams/{stream_id}/{action}'
+        return self._signed_request('PUT', uri)
 
-    def pause_monitor(self, stream_id: str) -> str:
+    def pause_monitor(self, stream_id: str) -> dict:
         """Pause a monitor.
 
         Convenience alias for self.action_monitor(stream_id, "pause")
 
-        Response is json string {"message": "success"} if successful."""
+        Response is decoded json {"message": "success"} if successful."""
 
         return self.action_monitor(stream_id, 'pause')
 
-    def restart_monitor(self, stream_id: str) -> str:
+    def restart_monitor(self, stream_id: str) -> dict:
         """Restart a monitor.
 
         Convenience alias for self.action_monitor(stream_id, "restart")
 
-        Response is json string {"message": "success"} if successful."""
+        Response is decoded json {"message": "success"} if successful."""
 
         return self.action_monitor(stream_id, 'restart')
 
 
+class AsyncACRCloudConsole(ACRCloudConsole):
+    """Asynchronous version of ACRCloudConsole backed by an HTTP/2 httpx.AsyncClient.
+
+    Usage: AsyncACRCloudConsole(account_access_key, account_access_secret)
+
+    Every ACRCloudConsole method is available and returns an awaitable, so many requests can share one
+    multiplexed connection, e.g. await asyncio.gather(*(console.get_monitor(id_) for id_ in stream_ids))
+
+    Requires httpx with HTTP/2 support: pip install httpx[http2]"""
+
+    def __enter__(self):
+        raise TypeError("AsyncACRCloudConsole must be used with 'async with', not 'with'")
+
+    def __exit__(self, *exc_info):
+        raise TypeError("AsyncACRCloudConsole must be used with 'async with', not 'with'")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP client and its pooled connections."""
+
+        await self._session.aclose()
+
+    def _open_session(self):
+        """Helper function."""
+
+        if httpx is None:
+            raise ImportError('AsyncACRCloudConsole requires httpx: pip install httpx[http2]')
+        if isinstance(self._timeout, tuple):
+            connect, read = self._timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        else:
+            timeout = httpx.Timeout(self._timeout)
+        return httpx.AsyncClient(http2=True, base_url=self._base_url, limits=httpx.Limits(max_keepalive_connections=20), timeout=timeout)
+
+    async def _signed_request(self, http_method: str, uri: str, data: dict=None, params: dict=None):
+        """Helper function.
+
+        Signs and sends a request to the console API and returns the decoded json response body (None if empty).
+        Raises httpx.HTTPStatusError for an error status."""
+
+        headers = self._signed_headers(http_method, uri)
+        try:
+            response = await self._session.request(http_method, uri, data=data, params=params, headers=headers)
+        finally:
+            if http_method != 'GET':
+                self.invalidate()
+        return _decode(response)
+
+
 class ACRCloudStreamMonitor:
     """ACRCloud's web API for stream monitor results.
 
@@ -344,53 +460,70 @@ class ACRCloudStreamMonitor:
 
     See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/"""
 
-    def __init__(self, project_access_key: str, stream_id: str):
+    def __init__(self, project_access_key: str, stream_id: str, timeout=(5, 30), session: requests.Session=None):
         """Get project_access_key from Broadcast Monitoring project page on acrcloud.com.
-        Click project name on Stream Management page to find stream_id."""
+        Click project name on Stream Management page to find stream_id.
+
+        timeout is seconds as a (connect, read) tuple or a single number for both
+
+        session is an existing requests.Session to share with other monitors, which close() then leaves open"""
 
         self.access_key = project_access_key
         self.stream_id = stream_id
+        self._timeout = timeout
+        self._results_url = f'https://api.acrcloud.com/v1/monitor-streams/{stream_id}/results'
+        self._owns_session = session is None
+        self._session = _new_session() if session is None else session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections, unless it was passed in to be shared."""
+
+        if self._owns_session:
+            self._session.close()
+
+    def _results(self, **params):
+        """Helper function.
+
+        Requests the stream's results and returns the decoded json response body (None if empty).
+        Raises requests.HTTPError for an error status."""
 
-    def last_results(self) -> str:
+        response = self._session.get(self._results_url, params={'access_key': self.access_key, **params}, timeout=self._timeout)
+        return _decode(response)
+
+    def last_results(self) -> dict:
         """Gets the last result that the monitor service detects from the stream.
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/
 
-        Response is JSON as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
+        Response is decoded json as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
 
-        requrl = 'https://api.acrcloud.com/v1/monitor-streams/{}/results?access_key={}'\
-            .format(self.stream_id, self.access_key)
-        response = requests.get(requrl)
-        response.encoding = 'utf-8'
-        return response.text
+        return self._results()
 
-    def current_results(self) -> str:
+    def current_results(self) -> dict:
         """Gets the last result that displayed “no result”, when it doesn’t detect any result.
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/
 
-        Response is JSON as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
+        Response is decoded json as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
 
-        requrl = 'https://api.acrcloud.com/v1/monitor-streams/{}/results?access_key={}&type=current'\
-            .format(self.stream_id, self.access_key)
-        response = requests.get(requrl)
-        response.encoding = 'utf-8'
-        return response.text
+        return self._results(type='current')
 
-    def multiple_last_results(self, limit: int) -> str:
+    def multiple_last_results(self, limit: int) -> dict:
         """Gets multiple last results, from the last 1 result to the last 100 results.
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/
 
-        Response is JSON as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
+        Response is decoded json as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
 
-        requrl = 'https://api.acrcloud.com/v1/monitor-streams/{}/results?access_key={}&limit={}'\
-            .format(self.stream_id, self.access_key, limit)
-        response = requests.get(requrl)
-        response.encoding = 'utf-8'
-        return response.text
+        return self._results(limit=limit)
 
-    def day_results(self, date: str) -> str:
+    def day_results(self, date: str) -> dict:
         """Gets full day results in last 30 days.
 
         date is in YYYYMMDD format
@@ -401,29 +534,55 @@ class ACRCloudStreamMonitor:
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/
 
-        Response is JSON as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
+        Response is decoded json as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
 
-        requrl = 'https://api.acrcloud.com/v1/monitor-streams/{}/results?access_key={}&date={}'\
-            .format(self.stream_id, self.access_key, date)
-        response = requests.get(requrl)
-        response.encoding = 'utf-8'
-        return response.text
+        return self._results(date=date)
 
-    def month_results(self, month: str):
+    def month_results(self, month: str, dest=None):
         """Gets full month monitoring results of any past month.
 
         month is in YYYYMM format
 
-        downloads a .zip file
+        downloads a .zip file, streamed in chunks to dest, which is a file path or a writable binary file object
+
+        If dest is None, an iterator over the .zip file's bytes in chunks is returned instead
+
+        Raises requests.HTTPError, before dest is touched, if there are no results for the month.
+        If the download fails part way, a partially written dest path is removed.
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/"""
 
-        requrl = 'https://monitoring-result.acrcloud.com/{}/{}/{}.zip'\
-            .format(self.access_key, self.stream_id, month)
-        response = requests.get(requrl)
-        return response  # Or should something else be returned because it's a file?
+        requrl = f'https://monitoring-result.acrcloud.com/{self.access_key}/{self.stream_id}/{month}.zip'
+        response = self._session.get(requrl, stream=True, timeout=self._timeout)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        if dest is None:
+            return self._iter_chunks(response)
+        with response:
+            chunks = response.iter_content(chunk_size=64 * 1024)
+            if not isinstance(dest, (str, os.PathLike)):
+                dest.writelines(chunks)
+                return
+            file = open(dest, 'wb')
+            try:
+                with file:
+                    file.writelines(chunks)
+            except BaseException:
+                os.remove(dest)
+                raise
+
+    def _iter_chunks(self, response):
+        """Helper function.
 
-    def period_results(self, begin_time: str, end_time: str='') -> str:
+        Yields the body of a streamed download in 64 KiB chunks so it is never held in memory whole."""
+
+        with response:
+            yield from response.iter_content(chunk_size=64 * 1024)
+
+    def period_results(self, begin_time: str, end_time: str='') -> dict:
         """Gets monitoring results in a certain period of the last 24 hours.
 
         begin_time and end_time are in YYYYMMDDHHMMSS format
@@ -434,13 +593,75 @@ class ACRCloudStreamMonitor:
 
         See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/
 
-        Response is JSON as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
+        Response is decoded json as described at www.acrcloud.com/docs/acrcloud/metadata/music/"""
+
+        return self._results(begin_time=begin_time, end_time=end_time)
+
+
+class ACRCloudStreamMonitorPool:
+    """ACRCloud's web API for polling the results of many streams at once.
+
+    Usage: ACRCloudStreamMonitorPool(project_access_key, stream_ids)
+
+    Requests for all the streams run concurrently in threads sharing one pooled session.
+
+    See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/"""
+
+    def __init__(self, project_access_key: str, stream_ids: list, timeout=(5, 30), max_workers: int=16, session: requests.Session=None):
+        """Get project_access_key from Broadcast Monitoring project page on acrcloud.com.
+        Click project names on Stream Management page to find stream_ids.
+
+        Repeated stream_ids are polled once.
+
+        timeout is seconds as a (connect, read) tuple or a single number for both
+
+        max_workers is the most requests in flight at once, at least 1
+
+        session is an existing requests.Session to use, which close() then leaves open"""
+
+        if max_workers < 1:
+            raise ValueError(f'max_workers must be at least 1, not {max_workers}')
+        self.access_key = project_access_key
+        self.stream_ids = list(dict.fromkeys(stream_ids))
+        self._max_workers = max_workers
+        self._owns_session = session is None
+        self._session = _new_session() if session is None else session
+        self._monitors = {stream_id: ACRCloudStreamMonitor(project_access_key, stream_id, timeout, session=self._session)
+                          for stream_id in self.stream_ids}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections, unless it was passed in to be shared."""
+
+        if self._owns_session:
+            self._session.close()
+
+    def last_results(self) -> tuple:
+        """Gets the last result that the monitor service detects from each stream.
+
+        See www.acrcloud.com/docs/audio-fingerprinting-api/monitoring-api/
 
-        requrl = 'https://api.acrcloud.com/v1/monitor-streams/{}/results?access_key={}&begin_time={}&end_time={}'\
-            .format(self.stream_id, self.access_key, begin_time, end_time)
-        response = requests.get(requrl)
-        response.encoding = 'utf-8'
-        return response.text
+        Response is a (results, errors) tuple of dicts keyed by stream_id:
+            results holds the decoded json, as described at www.acrcloud.com/docs/acrcloud/metadata/music/, of each stream that succeeded
+            errors holds the exception raised for each stream that failed, so one failure does not lose the other streams' results"""
+
+        results, errors = {}, {}
+        if not self._monitors:
+            return results, errors
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self._max_workers, len(self._monitors))) as executor:
+            futures = {stream_id: executor.submit(monitor.last_results) for stream_id, monitor in self._monitors.items()}
+        for stream_id, future in futures.items():
+            error = future.exception()
+            if error is None:
+                results[stream_id] = future.result()
+            else:
+                errors[stream_id] = error
+        return results, errors
 
 if __name__ == '__main__':
     account_access_key = 'XXXX'
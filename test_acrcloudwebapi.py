@@ -0,0 +1,371 @@
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import hmac
+import http.server
+import json
+import threading
+
+import pytest
+import requests
+
+import acrcloudwebapi
+
+
+def make_response(content: bytes, status_code: int=200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+API = 'https://api.acrcloud.com'
+
+
+class FakeSession:
+    """Stands in for requests.Session, or for httpx.AsyncClient when delays are given.
+
+    routes maps each url to a response, or to a function of (method, kwargs) returning one.
+    delays maps an http method to the seconds an async request waits before it is answered."""
+
+    def __init__(self, routes, delays=None):
+        self.routes = routes
+        self.delays = delays
+        self.requests = []
+        self.closed = False
+
+    def respond(self, method, url, kwargs):
+        route = self.routes[url]
+        return route(method, kwargs) if callable(route) else route
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        if self.delays is None:
+            return self.respond(method, url, kwargs)
+        return self.respond_later(method, url, kwargs)
+
+    async def respond_later(self, method, url, kwargs):
+        await asyncio.sleep(self.delays.get(method, 0))
+        return self.respond(method, url, kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        self.closed = True
+
+
+def make_monitor(response) -> acrcloudwebapi.ACRCloudStreamMonitor:
+    session = FakeSession({
+        f'{API}/v1/monitor-streams/stream/results': response,
+        'https://monitoring-result.acrcloud.com/key/stream/202601.zip': response})
+    return acrcloudwebapi.ACRCloudStreamMonitor('key', 'stream', session=session)
+
+
+def test_monitor_results_decode_json():
+    monitor = make_monitor(make_response(b'{"status": {"code": 0}}'))
+    assert monitor.last_results() == {'status': {'code': 0}}
+    _, url, kwargs = monitor._session.requests[0]
+    assert url == 'https://api.acrcloud.com/v1/monitor-streams/stream/results'
+    assert kwargs['params'] == {'access_key': 'key'}
+
+
+def test_monitor_results_empty_body_is_none():
+    monitor = make_monitor(make_response(b''))
+    assert monitor.current_results() is None
+
+
+def test_monitor_results_raise_for_error_status():
+    monitor = make_monitor(make_response(b'<html>Not Found</html>', 404))
+    with pytest.raises(requests.HTTPError):
+        monitor.day_results('20260101')
+
+
+@pytest.fixture
+def unavailable_server():
+    """A local server answering every request with 503, recording the methods it received."""
+
+    methods = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def respond(self):
+            methods.append(self.command)
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        do_GET = do_DELETE = respond
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/', methods
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('method, attempts', [('GET', 4), ('DELETE', 1)])
+def test_session_retries_then_surfaces_http_error(unavailable_server, method, attempts):
+    url, methods = unavailable_server
+    session = acrcloudwebapi._new_session()
+    session.mount('http://', session.get_adapter('https://api.acrcloud.com'))
+    response = session.request(method, url, timeout=5)
+    with pytest.raises(requests.HTTPError):
+        acrcloudwebapi._decode(response)
+    assert methods == [method] * attempts
+
+
+def test_month_results_writes_to_path(tmp_path):
+    monitor = make_monitor(make_response(b'PK' + bytes(100000)))
+    dest = tmp_path / 'results.zip'
+    monitor.month_results('202601', dest)
+    assert dest.read_bytes() == b'PK' + bytes(100000)
+    _, url, kwargs = monitor._session.requests[0]
+    assert url == 'https://monitoring-result.acrcloud.com/key/stream/202601.zip'
+    assert kwargs['stream'] is True
+
+
+def test_month_results_error_leaves_existing_file(tmp_path):
+    monitor = make_monitor(make_response(b'Not Found', 404))
+    dest = tmp_path / 'results.zip'
+    dest.write_bytes(b'previous download')
+    with pytest.raises(requests.HTTPError):
+        monitor.month_results('202601', dest)
+    assert dest.read_bytes() == b'previous download'
+
+
+def test_month_results_removes_partial_file(tmp_path):
+    response = make_response(b'')
+    def failing_chunks(chunk_size):
+        yield b'PK'
+        raise requests.ConnectionError()
+
+    response.iter_content = failing_chunks
+    monitor = make_monitor(response)
+    dest = tmp_path / 'results.zip'
+    with pytest.raises(requests.ConnectionError):
+        monitor.month_results('202601', dest)
+    assert not dest.exists()
+
+
+def test_month_results_without_dest_iterates_chunks():
+    monitor = make_monitor(make_response(b'PK' + bytes(100000)))
+    chunks = monitor.month_results('202601')
+    assert b''.join(chunks) == b'PK' + bytes(100000)
+
+
+class FakeSessionMixin:
+    """Opens the given FakeSession instead of a real HTTP session."""
+
+    def __init__(self, session=None, secret=b'secret'):
+        self.fake_session = FakeSession({}) if session is None else session
+        super().__init__('key', secret)
+
+    def _open_session(self):
+        return self.fake_session
+
+
+class StubConsole(FakeSessionMixin, acrcloudwebapi.ACRCloudConsole):
+    """ACRCloudConsole talking to a FakeSession."""
+
+
+class StubAsyncConsole(FakeSessionMixin, acrcloudwebapi.AsyncACRCloudConsole):
+    """AsyncACRCloudConsole talking to a FakeSession."""
+
+
+def monitor_routes(monitors, prefix=API) -> dict:
+    """Routes serving monitor details from a dict of stream_id to details, which a PUT replaces with {'v': 'new'}."""
+
+    def route(stream_id):
+        def respond(method, kwargs):
+            if method == 'PUT':
+                monitors[stream_id] = {'v': 'new'}
+            return make_response(json.dumps(monitors[stream_id]).encode())
+        return respond
+
+    return {f'{prefix}/v1/monitor-streams/{stream_id}': route(stream_id) for stream_id in monitors}
+
+
+def make_console(monitors=None) -> StubConsole:
+    return StubConsole(FakeSession(monitor_routes({'s1': {'v': 'old'}, 's2': {'v': 'old'}} if monitors is None else monitors)))
+
+
+def test_async_console_rejects_sync_with():
+    with pytest.raises(TypeError, match='async with'):
+        with StubAsyncConsole():
+            pass
+
+
+def test_get_all_monitors_sends_get_with_query():
+    console = StubConsole(FakeSession({f'{API}/v1/monitor-streams': make_response(b'{"items": []}')}))
+    assert console.get_all_monitors('my project') == {'items': []}
+    [(method, url, kwargs)] = console._session.requests
+    assert (method, url) == ('GET', f'{API}/v1/monitor-streams')
+    assert kwargs['params'] == {'project_name': 'my project'}
+    assert kwargs['data'] is None
+    headers = kwargs['headers']
+    string_to_sign = f'GET\n/v1/monitor-streams\nkey\n1\n{headers["timestamp"]}'.encode()
+    expected = base64.b64encode(hmac.new(b'secret', string_to_sign, hashlib.sha1).digest()).decode()
+    assert headers['signature'] == expected
+
+
+def test_cache_hit_skips_request():
+    console = make_console()
+    assert console.get_monitor('s1') == {'v': 'old'}
+    assert console.get_monitor(stream_id='s1') == {'v': 'old'}
+    assert len(console._session.requests) == 1
+
+
+def test_cache_expires_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(acrcloudwebapi.time, 'monotonic', lambda: clock[0])
+    console = make_console()
+    console.get_monitor('s1')
+    clock[0] += 9.9
+    console.get_monitor('s1')
+    assert len(console._session.requests) == 1
+    clock[0] += 0.2
+    console.get_monitor('s1')
+    assert len(console._session.requests) == 2
+
+
+def test_cache_evicts_least_recently_used():
+    class SmallCacheConsole(StubConsole):
+        @acrcloudwebapi._ttl_cache(maxsize=2)
+        def get_monitor(self, stream_id):
+            return self._signed_request('GET', f'/v1/monitor-streams/{stream_id}')
+
+    console = SmallCacheConsole(FakeSession(monitor_routes({'a': {}, 'b': {}, 'c': {}})))
+    for stream_id in 'a', 'b', 'a', 'c':
+        console.get_monitor(stream_id)
+    assert [args for _, args in console._cache] == [('a',), ('c',)]
+    console.get_monitor('b')
+    assert len(console._session.requests) == 4
+
+
+def test_cache_returns_copies():
+    console = make_console()
+    console.get_monitor('s1')['v'] = 'mutated'
+    assert console.get_monitor('s1') == {'v': 'old'}
+
+
+def test_write_evicts_reads_made_while_it_was_pending():
+    console = make_console()
+    write = console._session.routes[f'{API}/v1/monitor-streams/s1']
+
+    def read_during_write(method, kwargs):
+        if method == 'PUT':
+            assert console.get_monitor('s1') == {'v': 'old'}
+        return write(method, kwargs)
+
+    console._session.routes[f'{API}/v1/monitor-streams/s1'] = read_during_write
+    console.get_monitor('s2')
+    console.update_monitor('s1', 'name', 'http://example.com/stream.mp3')
+    assert console._cache == {}
+    assert console.get_monitor('s1') == {'v': 'new'}
+
+
+def test_delete_project_clears_cached_monitors():
+    console = make_console()
+    console._session.routes[f'{API}/v1/projects/proj'] = make_response(b'')
+    console.get_monitor('s1')
+    console.delete_project('proj')
+    assert console._cache == {}
+
+
+def test_invalidate_by_argument():
+    console = make_console()
+    console.get_monitor('s1')
+    console.get_monitor('s2')
+    console.invalidate(stream_id='s1')
+    assert [args for _, args in console._cache] == [('s2',)]
+
+
+def test_invalidate_from_threads_while_reading():
+    console = make_console({str(i): {} for i in range(50)})
+
+    def work(i):
+        console.get_monitor(str(i % 50))
+        if i % 7 == 0:
+            console.invalidate(stream_id=str(i % 50))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(2000)))
+    assert len(console._cache) <= 50
+    assert all(name == 'get_monitor' and value == {} for (name, _), (_, value, _) in console._cache.items())
+    assert len(console._session.requests) < 2000
+
+    console.invalidate()
+    assert console._cache == {}
+    requests_made = len(console._session.requests)
+    assert console.get_monitor('0') == {}
+    assert len(console._session.requests) == requests_made + 1
+
+
+def make_async_console(delays) -> StubAsyncConsole:
+    return StubAsyncConsole(FakeSession(monitor_routes({'s': {'v': 'old'}}, prefix=''), delays))
+
+
+def test_async_cache_hit():
+    async def main():
+        console = make_async_console({})
+        assert await console.get_monitor('s') == {'v': 'old'}
+        assert await console.get_monitor('s') == {'v': 'old'}
+        assert len(console._session.requests) == 1
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('delays', [{'PUT': 0.01}, {'GET': 0.01}])
+def test_async_read_overlapping_write_is_not_kept(delays):
+    async def main():
+        console = make_async_console(delays)
+        await asyncio.gather(
+            console.update_monitor('s', 'name', 'http://example.com/stream.mp3'), console.get_monitor('s'))
+        assert await console.get_monitor('s') == {'v': 'new'}
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('secret', [b'secret', bytearray(b'secret'), 'secret'])
+def test_console_accepts_bytes_or_str_secret(secret):
+    assert StubConsole(secret=secret).access_secret == b'secret'
+
+
+@pytest.mark.parametrize('secret', [4, None, ['s']])
+def test_console_rejects_other_secret_types(secret):
+    with pytest.raises(TypeError):
+        StubConsole(secret=secret)
+
+
+def test_pool_separates_results_from_errors():
+    session = FakeSession({
+        f'{API}/v1/monitor-streams/{stream_id}/results': response for stream_id, response in
+        [('a', make_response(b'{"n": 1}')), ('b', make_response(b'oops', 500)), ('c', make_response(b'{"n": 3}'))]})
+    pool = acrcloudwebapi.ACRCloudStreamMonitorPool('key', ['a', 'b', 'c', 'a'], session=session)
+    assert pool.stream_ids == ['a', 'b', 'c']
+    results, errors = pool.last_results()
+    assert results == {'a': {'n': 1}, 'c': {'n': 3}}
+    assert list(errors) == ['b'] and isinstance(errors['b'], requests.HTTPError)
+    assert len(session.requests) == 3
+
+
+def test_pool_monitors_share_one_session():
+    pool = acrcloudwebapi.ACRCloudStreamMonitorPool('key', ['a', 'b'])
+    assert all(monitor._session is pool._session for monitor in pool._monitors.values())
+
+
+def test_shared_session_is_left_open():
+    session = FakeSession({})
+    acrcloudwebapi.ACRCloudStreamMonitor('key', 'a', session=session).close()
+    acrcloudwebapi.ACRCloudStreamMonitorPool('key', ['a'], session=session).close()
+    assert not session.closed
+
+
+def test_pool_rejects_non_positive_max_workers():
+    with pytest.raises(ValueError, match='max_workers'):
+        acrcloudwebapi.ACRCloudStreamMonitorPool('key', ['a'], max_workers=0)